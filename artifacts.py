@@ -0,0 +1,153 @@
+# artifacts.py
+# 모델 아티팩트 관리
+# - 소스: 'gdrive:<파일 ID>' / 'http(s)://...' / 'file:<경로>' 또는 그냥 로컬 경로
+# - 내용 주소 기반 로컬 캐시(<cache_dir>/<sha256>.pkl) + 체크섬 검증
+# - 임시 파일에 받은 뒤 os.replace로 원자적 교체 (중간에 죽어도 잘린 pickle이 남지 않음)
+# - 무거운 import(fastai/torch)는 처음 쓸 때까지 미룸 + 시작 단계별 시간 측정
+import hashlib, json, os, tempfile, time, urllib.request
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+CHUNK = 1 << 20
+
+
+def sha256_file(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+@contextmanager
+def timed(report: dict, stage: str):
+    """블록 실행 시간을 report[stage]에 ms 단위로 기록."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        report[stage] = round((time.perf_counter() - t0) * 1000, 1)
+
+
+def parse_source(source: str) -> tuple[str, str]:
+    """소스 문자열 -> (종류, 참조). 종류: gdrive / http / file"""
+    if source.startswith("gdrive:"): return "gdrive", source[len("gdrive:"):]
+    if source.startswith(("http://", "https://")): return "http", source
+    if source.startswith("file:"): return "file", source[len("file:"):]
+    return "file", source
+
+
+class ArtifactStore:
+    """내용 주소 기반 아티팩트 캐시. index.json에 소스 -> sha256 매핑을 보관한다."""
+
+    def __init__(self, cache_dir: str | os.PathLike = ".model_cache", suffix: str = ".pkl"):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.suffix = suffix
+        self.index_path = self.cache_dir / "index.json"
+
+    def path_for(self, digest: str) -> Path:
+        return self.cache_dir / f"{digest}{self.suffix}"
+
+    def fetch(self, source: str, sha256: str | None = None, verify: bool = True) -> Path:
+        """소스에서 아티팩트를 가져와 로컬 경로 반환. sha256이 주어지면 불일치 시 ValueError."""
+        kind, ref = parse_source(source)
+        if kind == "file":
+            path = Path(ref)
+            if not path.exists(): raise FileNotFoundError(f"모델 파일이 없습니다: {path}")
+            if sha256 and sha256_file(path) != sha256:
+                raise ValueError(f"체크섬 불일치: {path}")
+            return path
+
+        index = self._read_index()
+        digest = sha256 or index.get(source)
+        if digest:
+            path = self.path_for(digest)
+            if path.exists() and (not verify or sha256_file(path) == digest):
+                return path
+            if path.exists(): path.unlink()  # 손상된 캐시 -> 다시 받기
+
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+        os.close(fd)
+        try:
+            self._download(kind, ref, tmp)
+            got = sha256_file(tmp)
+            if sha256 and got != sha256:
+                raise ValueError(f"체크섬 불일치: 기대 {sha256[:12]}…, 실제 {got[:12]}…")
+            path = self.path_for(got)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp): os.remove(tmp)
+        index[source] = got
+        self._write_index(index)
+        return path
+
+    def evict(self, source: str):
+        """source의 캐시 파일과 index 항목을 지운다 (잘린/손상된 아티팩트를 다시 받기 위함)."""
+        index = self._read_index()
+        digest = index.pop(source, None)
+        if digest:
+            self.path_for(digest).unlink(missing_ok=True)
+            self._write_index(index)
+
+    def _download(self, kind: str, ref: str, dst: str):
+        if kind == "gdrive":
+            import gdown
+            if not gdown.download(f"https://drive.google.com/uc?id={ref}", dst, quiet=True):
+                raise RuntimeError(f"Google Drive 다운로드 실패: {ref}")
+            return
+        with urllib.request.urlopen(ref, timeout=60) as r, open(dst, "wb") as f:
+            for chunk in iter(lambda: r.read(CHUNK), b""):
+                f.write(chunk)
+
+    def _read_index(self) -> dict:
+        try:
+            return json.loads(self.index_path.read_text("utf-8"))
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _write_index(self, index: dict):
+        tmp = self.index_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(index, indent=2), "utf-8")
+        os.replace(tmp, self.index_path)
+
+
+def _fetch_and_unpickle(load_learner, store: ArtifactStore, source: str, sha256, verify: bool, report: dict):
+    with timed(report, "fetch"):
+        path = store.fetch(source, sha256, verify)
+    try:
+        with timed(report, "unpickle"):
+            return load_learner(path, cpu=True), path
+    except Exception:
+        if parse_source(source)[0] == "file": raise
+        store.evict(source)  # 캐시된 파일이 잘렸거나 손상됨 -> 지우고 한 번 다시 받기
+    with timed(report, "refetch"):
+        path = store.fetch(source, sha256, verify)
+    with timed(report, "unpickle"):
+        return load_learner(path, cpu=True), path
+
+
+def load_model(store: ArtifactStore, source: str, sha256: str | None = None, verify: bool = True,
+               fallback: str | None = None):
+    """아티팩트를 가져와 fastai Learner로 로드. 반환: (learner, 로컬 경로, 단계별 시간(ms))
+    source를 가져오거나 unpickle하지 못하면(체크섬 불일치, 잘린 pickle 등) fallback 소스로 다시 시도하고
+    사유를 report["fallback"]에 남긴다."""
+    report: dict = {}
+    with timed(report, "import"):
+        from fastai.vision.all import load_learner
+    try:
+        learner, path = _fetch_and_unpickle(load_learner, store, source, sha256, verify, report)
+    except Exception as e:
+        if not fallback or fallback == source: raise
+        report["fallback"] = f"{source} -> {fallback} ({type(e).__name__}: {e})"
+        learner, path = _fetch_and_unpickle(load_learner, store, fallback, sha256, verify, report)
+    return learner, str(path), report
+
+
+def warm_in_background(fn, *args, **kwargs) -> Future:
+    """fn을 백그라운드 스레드에서 실행 (UI 렌더링과 모델 로드를 겹치기 위함)."""
+    ex = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-warm")
+    fut = ex.submit(fn, *args, **kwargs)
+    ex.shutdown(wait=False)
+    return fut
@@ -0,0 +1,238 @@
+# backends.py
+# 추론 백엔드: fastai(기본) / ONNX Runtime / TorchScript (+ 선택적 동적 int8 양자화)
+# 모든 백엔드는 predict_batch(PIL 이미지 리스트) -> (N, C) 확률을 반환하며,
+# 확률 벡터의 열 순서는 learner.dls.vocab 순서와 같다.
+import argparse, json, os, time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from inference import fastai_predict_batch
+
+BACKENDS = ("fastai", "onnx", "torchscript")
+
+
+# ======================
+# fastai 전처리 사양 추출 + NumPy 재현
+# ======================
+def export_spec(learner) -> dict:
+    """learner.dls의 Resize / IntToFloatTensor / Normalize 설정을 직렬화 가능한 dict로 추출."""
+    resize = next((t for t in learner.dls.after_item.fs if type(t).__name__ == "Resize"), None)
+    if resize is None:
+        raise ValueError("Resize 변환을 찾을 수 없어 전처리를 재현할 수 없습니다.")
+    mean, std, div = [0.0, 0.0, 0.0], [1.0, 1.0, 1.0], 255.0
+    for t in learner.dls.after_batch.fs:
+        if type(t).__name__ == "IntToFloatTensor": div = float(getattr(t, "div", 255.0) or 1.0)
+        if type(t).__name__ == "Normalize":
+            mean = [float(x) for x in t.mean.reshape(-1)]
+            std = [float(x) for x in t.std.reshape(-1)]
+    loss_name = type(getattr(learner, "loss_func", None)).__name__
+    return {
+        "vocab": [str(x) for x in learner.dls.vocab],
+        "size": [int(x) for x in resize.size],  # (w, h)
+        "method": str(resize.method),
+        "pad_mode": str(resize.pad_mode),
+        "mean": mean, "std": std, "div": div,
+        "activation": "sigmoid" if "BCE" in loss_name else "softmax",
+    }
+
+
+_NP_PAD = {"reflection": "reflect", "zeros": "constant", "border": "edge"}
+
+def fastai_resize(pil: Image.Image, size, method: str = "crop", pad_mode: str = "reflection") -> Image.Image:
+    """fastai Resize의 검증(중앙) 동작을 PIL/NumPy로 재현."""
+    tw, th = size
+    if method == "squish": return pil.resize((tw, th), Image.BILINEAR)
+    w, h = pil.size
+    m = min(w / tw, h / th) if method == "crop" else max(w / tw, h / th)
+    cw, ch = int(m * tw), int(m * th)
+    left, top = int(0.5 * (w - cw)), int(0.5 * (h - ch))
+    if method == "crop":
+        return pil.crop((left, top, left + cw, top + ch)).resize((tw, th), Image.BILINEAR)
+    arr = np.asarray(pil)
+    pl, pt = max(0, -left), max(0, -top)
+    arr = np.pad(arr, ((pt, max(0, ch - h - pt)), (pl, max(0, cw - w - pl)), (0, 0)),
+                 mode=_NP_PAD.get(pad_mode, "reflect"))
+    return Image.fromarray(arr).resize((tw, th), Image.BILINEAR)
+
+
+def to_batch_array(items, spec: dict) -> np.ndarray:
+    """PIL 이미지 리스트 -> (N, 3, H, W) float32 (0~255). 정규화는 내보낸 모델 안에서 수행."""
+    arrs = [np.asarray(fastai_resize(im.convert("RGB") if im.mode != "RGB" else im,
+                                     spec["size"], spec["method"], spec["pad_mode"]))
+            for im in items]
+    return np.ascontiguousarray(np.stack(arrs).transpose(0, 3, 1, 2), dtype=np.float32)
+
+
+# ======================
+# 백엔드
+# ======================
+class FastaiBackend:
+    name = "fastai"
+
+    def __init__(self, learner):
+        self.learner = learner
+
+    def predict_batch(self, items) -> np.ndarray:
+        return fastai_predict_batch(self.learner, items)
+
+
+class OnnxBackend:
+    name = "onnx"
+
+    def __init__(self, path: str, spec: dict, threads: int = 0):
+        import onnxruntime as ort
+        opts = ort.SessionOptions()
+        if threads: opts.intra_op_num_threads = int(threads)
+        self.spec = spec
+        self.session = ort.InferenceSession(path, opts, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def predict_batch(self, items) -> np.ndarray:
+        return self.session.run(None, {self.input_name: to_batch_array(items, self.spec)})[0]
+
+
+class TorchScriptBackend:
+    name = "torchscript"
+
+    def __init__(self, path: str, spec: dict):
+        import torch
+        self.spec = spec
+        self.module = torch.jit.load(path, map_location="cpu").eval()
+
+    def predict_batch(self, items) -> np.ndarray:
+        import torch
+        with torch.inference_mode():
+            return self.module(torch.from_numpy(to_batch_array(items, self.spec))).numpy()
+
+
+# ======================
+# 내보내기 (모델 지문별 1회)
+# ======================
+def _wrapped_model(learner, spec: dict):
+    """정규화 + 모델 + 활성화(softmax/sigmoid)를 하나의 nn.Module로 묶는다."""
+    import torch
+    from torch import nn
+
+    class Wrapped(nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+            self.register_buffer("mean", torch.tensor(spec["mean"]).view(1, -1, 1, 1) * spec["div"])
+            self.register_buffer("std", torch.tensor(spec["std"]).view(1, -1, 1, 1) * spec["div"])
+            self.sigmoid = spec["activation"] == "sigmoid"
+
+        def forward(self, x):
+            out = self.model((x - self.mean) / self.std)
+            return torch.sigmoid(out) if self.sigmoid else torch.softmax(out, dim=1)
+
+    return Wrapped(learner.model.cpu()).eval()
+
+
+def artifact_paths(model_path: str, fingerprint: str, kind: str, quantize: bool) -> tuple[Path, Path]:
+    ext = {"onnx": "onnx", "torchscript": "pt"}[kind]
+    stem = f"{Path(model_path).stem}.{fingerprint}{'.int8' if quantize else ''}"
+    out_dir = Path(model_path).parent
+    return out_dir / f"{stem}.{ext}", out_dir / f"{stem}.json"
+
+
+def export_model(learner, kind: str, path: Path, quantize: bool = False) -> dict:
+    """learner를 ONNX 또는 TorchScript로 내보내고 전처리 사양(spec)을 반환."""
+    import torch
+    spec = export_spec(learner)
+    model = _wrapped_model(learner, spec)
+    example = torch.zeros(1, 3, spec["size"][1], spec["size"][0])
+    tmp = path.with_name(path.name + ".tmp")
+    with torch.no_grad():  # inference_mode 텐서는 trace/export에서 문제를 일으킬 수 있음
+        if kind == "torchscript":
+            if quantize:
+                model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+            torch.jit.save(torch.jit.trace(model, example), str(tmp))
+        else:
+            # dynamo 내보내기 결과는 quantize_dynamic의 shape 추론과 충돌하므로 TorchScript 기반 내보내기 사용
+            torch.onnx.export(model, example, str(tmp), input_names=["input"], output_names=["probs"],
+                              dynamic_axes={"input": {0: "batch"}, "probs": {0: "batch"}}, opset_version=17,
+                              dynamo=False)
+            if quantize:
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                qtmp = path.with_name(path.name + ".q.tmp")
+                quantize_dynamic(str(tmp), str(qtmp), weight_type=QuantType.QInt8)
+                os.replace(qtmp, tmp)
+    os.replace(tmp, path)
+    return spec
+
+
+def load_backend(kind: str, learner, model_path: str, fingerprint: str,
+                 quantize: bool = False, threads: int = 0):
+    """kind 백엔드를 로드 (필요 시 1회 내보내기). 실패하면 fastai 백엔드로 대체.
+    반환: (backend, fallback_reason | None)"""
+    if kind == "fastai": return FastaiBackend(learner), None
+    try:
+        if kind not in BACKENDS: raise ValueError(f"알 수 없는 백엔드: {kind}")
+        path, meta = artifact_paths(model_path, fingerprint, kind, quantize)
+        vocab = [str(x) for x in learner.dls.vocab]
+        spec = json.loads(meta.read_text("utf-8")) if path.exists() and meta.exists() else None
+        if spec is None or spec.get("vocab") != vocab:
+            spec = export_model(learner, kind, path, quantize)
+            meta.write_text(json.dumps(spec, ensure_ascii=False), "utf-8")
+        backend = OnnxBackend(str(path), spec, threads) if kind == "onnx" else TorchScriptBackend(str(path), spec)
+        return backend, None
+    except Exception as e:
+        return FastaiBackend(learner), f"{type(e).__name__}: {e}"
+
+
+# ======================
+# 정확도 일치 / 지연 시간 비교
+# ======================
+def compare_backends(ref, other, images, batch_size: int = 8, repeats: int = 3) -> dict:
+    """ref(보통 fastai)와 other의 top-1 일치율, 확률 최대 오차, 이미지당 지연 시간 비교."""
+    def run(backend):
+        best, out = float("inf"), None
+        for _ in range(max(1, repeats)):
+            t0 = time.perf_counter()
+            out = np.concatenate([backend.predict_batch(images[i:i + batch_size])
+                                  for i in range(0, len(images), batch_size)])
+            best = min(best, time.perf_counter() - t0)
+        return out, best * 1000 / len(images)
+
+    p_ref, ms_ref = run(ref)
+    p_oth, ms_oth = run(other)
+    return {
+        "images": len(images),
+        "top1_agreement": float(np.mean(p_ref.argmax(1) == p_oth.argmax(1))),
+        "max_abs_prob_diff": float(np.max(np.abs(p_ref - p_oth))),
+        f"{ref.name}_ms_per_image": round(ms_ref, 3),
+        f"{other.name}_ms_per_image": round(ms_oth, 3),
+        "speedup": round(ms_ref / ms_oth, 2) if ms_oth else None,
+    }
+
+
+def main(argv=None):
+    from fastai.vision.all import load_learner
+    from preprocess import load_pil_from_bytes
+    from prediction_cache import model_fingerprint
+
+    ap = argparse.ArgumentParser(description="내보낸 백엔드와 fastai의 정확도/지연 시간 비교")
+    ap.add_argument("images", help="비교에 사용할 이미지 디렉터리")
+    ap.add_argument("--model", default="model.pkl")
+    ap.add_argument("--backend", choices=BACKENDS[1:], default="onnx")
+    ap.add_argument("--quantize", action="store_true", help="동적 int8 양자화")
+    ap.add_argument("--limit", type=int, default=64)
+    ap.add_argument("--batch-size", type=int, default=8)
+    args = ap.parse_args(argv)
+
+    learner = load_learner(args.model, cpu=True)
+    fp = model_fingerprint([str(x) for x in learner.dls.vocab], args.model)
+    backend, err = load_backend(args.backend, learner, args.model, fp, args.quantize)
+    if err: raise SystemExit(f"{args.backend} 백엔드 로드 실패: {err}")
+    files = sorted(p for p in Path(args.images).iterdir()
+                   if p.suffix.lower() in {".jpg", ".jpeg", ".png", ".webp", ".tiff"})[:args.limit]
+    images = [load_pil_from_bytes(p.read_bytes()) for p in files]
+    if not images: raise SystemExit("비교할 이미지가 없습니다.")
+    print(json.dumps(compare_backends(FastaiBackend(learner), backend, images, args.batch_size),
+                     ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
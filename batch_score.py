@@ -0,0 +1,260 @@
+# batch_score.py
+# 헤드리스 일괄 분류 CLI
+# 디렉터리 / glob / tar 의 이미지를 스트리밍으로 읽어
+#   리더 스레드 -> (유한 큐) -> 디코드 워커 N개 -> (유한 큐) -> 배치 추론 -> JSONL/CSV 즉시 기록
+# 메모리는 큐 크기 + 배치 크기로 제한되며, 출력 파일을 체크포인트로 삼아 중단 후 이어서 실행할 수 있다.
+#
+#   python batch_score.py ./photos -o results.jsonl --batch-size 32 --workers 4
+#   python batch_score.py "archive/**/*.jpg" -o results.csv --resume
+#   python batch_score.py images.tar -o results.jsonl --backend onnx
+import argparse, csv, glob, json, os, queue, sys, tarfile, threading, time
+from pathlib import Path
+
+import numpy as np
+
+from artifacts import ArtifactStore, load_model
+from backends import BACKENDS, load_backend
+from prediction_cache import model_fingerprint
+from preprocess import decode_for_model, load_pil_from_bytes, model_input_size
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".tiff", ".tif", ".bmp"}
+CSV_FIELDS = ["path", "label", "prob", "topk", "decode_ms", "infer_ms", "error"]
+_DONE = object()
+
+
+# ======================
+# 입력 열거 (스트리밍)
+# ======================
+def _is_image(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in IMAGE_EXTS
+
+
+def iter_inputs(spec: str, skip: set):
+    """(키, 바이트 또는 None) 생성. None이면 디코드 워커가 키(경로)에서 직접 읽는다."""
+    p = Path(spec)
+    if p.is_dir():
+        for root, dirs, files in os.walk(p):
+            dirs.sort()
+            for name in sorted(files):
+                key = os.path.join(root, name)
+                if _is_image(name) and key not in skip: yield key, None
+    elif p.is_file() and tarfile.is_tarfile(p):
+        with tarfile.open(p, "r|*") as tf:  # 스트림 모드: 멤버 목록 전체를 메모리에 올리지 않음
+            for m in tf:
+                key = f"{p}:{m.name}"
+                if m.isfile() and _is_image(m.name) and key not in skip:
+                    yield key, tf.extractfile(m).read()
+    else:
+        for key in glob.iglob(spec, recursive=True):
+            if _is_image(key) and key not in skip and os.path.isfile(key): yield key, None
+
+
+# ======================
+# 체크포인트 (= 출력 파일)
+# ======================
+def _trim_partial_line(path: Path, chunk: int = 1 << 16):
+    """비정상 종료로 잘린 마지막 줄을 뒤에서부터 찾아 잘라낸다 (파일 전체를 읽지 않음)."""
+    with open(path, "rb+") as f:
+        end = pos = f.seek(0, os.SEEK_END)
+        keep = 0
+        while pos > 0:
+            step = min(chunk, pos)
+            pos -= step
+            f.seek(pos)
+            i = f.read(step).rfind(b"\n")
+            if i >= 0:
+                keep = pos + i + 1
+                break
+        if keep != end: f.truncate(keep)
+
+
+def load_checkpoint(out_path: Path, fmt: str) -> set:
+    """이미 기록된 키 집합 (한 줄씩 읽음). 잘린 마지막 줄은 먼저 잘라낸다."""
+    if not out_path.exists(): return set()
+    _trim_partial_line(out_path)
+    done = set()
+    with open(out_path, encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            for row in csv.DictReader(f):
+                done.add(row["path"])
+        else:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["path"])
+                except (ValueError, KeyError):
+                    continue
+    return done
+
+
+def _error_row(key: str, decode_ms: float, err: str, infer_ms: float | None = None) -> dict:
+    return {"path": key, "label": None, "prob": None, "topk": [],
+            "decode_ms": round(decode_ms, 2), "infer_ms": infer_ms, "error": err}
+
+
+class ResultWriter:
+    def __init__(self, out_path: Path, fmt: str, append: bool):
+        new = not (append and out_path.exists() and out_path.stat().st_size > 0)
+        self.f = open(out_path, "a" if append else "w", encoding="utf-8", newline="")
+        self.fmt = fmt
+        self.csv = csv.DictWriter(self.f, fieldnames=CSV_FIELDS) if fmt == "csv" else None
+        if self.csv and new: self.csv.writeheader()
+
+    def write(self, rows: list[dict]):
+        for r in rows:
+            if self.csv:
+                self.csv.writerow({**r, "topk": json.dumps(r["topk"], ensure_ascii=False)})
+            else:
+                self.f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        self.f.flush()  # 배치 단위로 기록 -> 중단되어도 여기까지는 재개 시 건너뜀
+
+    def close(self):
+        self.f.close()
+
+
+# ======================
+# 파이프라인
+# ======================
+def run(args) -> dict:
+    out_path = Path(args.output)
+    fmt = args.format or ("csv" if out_path.suffix.lower() == ".csv" else "jsonl")
+    done = load_checkpoint(out_path, fmt) if args.resume else set()
+
+    learner, model_path, startup = load_model(ArtifactStore(args.cache_dir), args.model, args.sha256)
+    labels = [str(x) for x in learner.dls.vocab]
+    fp = model_fingerprint(labels, model_path)
+    backend, fallback = load_backend(args.backend, learner, model_path, fp, args.quantize, args.threads)
+    if fallback: print(f"[warn] {args.backend} 백엔드 사용 불가 -> fastai: {fallback}", file=sys.stderr)
+    target = model_input_size(learner)
+    from fastai.vision.core import PILImage
+
+    in_q: queue.Queue = queue.Queue(maxsize=args.queue_size)
+    out_q: queue.Queue = queue.Queue(maxsize=args.queue_size)
+    reader_error: list[BaseException] = []
+
+    def reader():
+        try:
+            for item in iter_inputs(args.input, done):
+                in_q.put(item)
+        except BaseException as e:
+            reader_error.append(e)
+        finally:
+            for _ in range(args.workers): in_q.put(_DONE)
+
+    def decoder():
+        while (item := in_q.get()) is not _DONE:
+            key, b = item
+            t0 = time.perf_counter()
+            try:
+                if b is None:
+                    with open(key, "rb") as f: b = f.read()
+                pil = load_pil_from_bytes(b) if args.preprocess == "legacy" else decode_for_model(b, target)
+                out_q.put((key, PILImage.create(pil), (time.perf_counter() - t0) * 1000, None))
+            except Exception as e:
+                out_q.put((key, None, (time.perf_counter() - t0) * 1000, f"{type(e).__name__}: {e}"))
+        out_q.put(_DONE)
+
+    threads = [threading.Thread(target=reader, name="reader", daemon=True)]
+    threads += [threading.Thread(target=decoder, name=f"decode-{i}", daemon=True) for i in range(args.workers)]
+    for t in threads: t.start()
+
+    writer = ResultWriter(out_path, fmt, append=args.resume)
+    k = max(1, min(args.topk, len(labels)))
+    n_ok = n_err = 0
+    t_start = last_report = time.perf_counter()
+    infer_s = 0.0
+
+    def flush(batch):
+        nonlocal n_ok, n_err, infer_s
+        if not batch: return
+        t0 = time.perf_counter()
+        try:
+            results = list(backend.predict_batch([x for _, x, _ in batch]))
+        except Exception:
+            # 배치 실패 -> 한 장씩 다시 돌려 실패한 이미지만 오류 행으로 기록
+            results = []
+            for _, x, _ in batch:
+                try:
+                    results.append(backend.predict_batch([x])[0])
+                except Exception as e:
+                    results.append(f"{type(e).__name__}: {e}")
+        dt = time.perf_counter() - t0
+        infer_s += dt
+        infer_ms = round(dt * 1000 / len(batch), 2)
+        rows = []
+        for (key, _, dec_ms), p in zip(batch, results):
+            if isinstance(p, str):
+                rows.append(_error_row(key, dec_ms, p, infer_ms))
+                n_err += 1
+                continue
+            top = np.argsort(-p)[:k]
+            rows.append({"path": key, "label": labels[top[0]], "prob": round(float(p[top[0]]), 6),
+                         "topk": [[labels[i], round(float(p[i]), 6)] for i in top],
+                         "decode_ms": round(dec_ms, 2), "infer_ms": infer_ms, "error": None})
+            n_ok += 1
+        writer.write(rows)
+        batch.clear()
+
+    batch, finished = [], 0
+    try:
+        while finished < args.workers:
+            item = out_q.get()
+            if item is _DONE:
+                finished += 1
+                continue
+            key, x, dec_ms, err = item
+            if err:
+                writer.write([_error_row(key, dec_ms, err)])
+                n_err += 1
+                continue
+            batch.append((key, x, dec_ms))
+            if len(batch) >= args.batch_size: flush(batch)
+            now = time.perf_counter()
+            if args.progress_every and now - last_report >= args.progress_every:
+                last_report = now
+                print(f"[progress] {n_ok + n_err} images, {n_ok / (now - t_start):.1f} img/s, "
+                      f"queue in={in_q.qsize()} out={out_q.qsize()}", file=sys.stderr)
+        flush(batch)
+    finally:
+        writer.close()
+    if reader_error: raise reader_error[0]
+
+    elapsed = time.perf_counter() - t_start
+    return {
+        "output": str(out_path), "format": fmt, "backend": backend.name,
+        "skipped_resume": len(done), "scored": n_ok, "errors": n_err,
+        "elapsed_s": round(elapsed, 2),
+        "images_per_s": round(n_ok / elapsed, 2) if elapsed else 0.0,
+        "inference_images_per_s": round(n_ok / infer_s, 2) if infer_s else 0.0,
+        "startup_ms": startup,
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="디렉터리/glob/tar 이미지 일괄 분류 (JSONL/CSV 출력)")
+    ap.add_argument("input", help="이미지 디렉터리, glob 패턴(따옴표로 감싸기) 또는 tar 파일")
+    ap.add_argument("-o", "--output", required=True, help="결과 파일 (.jsonl 또는 .csv)")
+    ap.add_argument("--format", choices=["jsonl", "csv"], help="기본값: 출력 확장자로 판단")
+    ap.add_argument("--model", default=os.environ.get("MODEL_SOURCE", "model.pkl"),
+                    help="모델 소스: 로컬 경로 / gdrive:<ID> / http(s) URL")
+    ap.add_argument("--sha256", default=None, help="모델 체크섬")
+    ap.add_argument("--cache-dir", default=".model_cache")
+    ap.add_argument("--backend", choices=BACKENDS, default="fastai")
+    ap.add_argument("--quantize", action="store_true")
+    ap.add_argument("--preprocess", choices=["fast", "legacy"], default="fast")
+    ap.add_argument("--batch-size", type=int, default=32)
+    ap.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1), help="디코드 워커 수")
+    ap.add_argument("--queue-size", type=int, default=128, help="단계 사이 큐 최대 길이 (메모리 상한)")
+    ap.add_argument("--threads", type=int, default=0, help="torch / onnxruntime intra-op 스레드 수")
+    ap.add_argument("--topk", type=int, default=3)
+    ap.add_argument("--resume", action="store_true", help="출력 파일에 이미 있는 항목은 건너뛰고 이어서 기록")
+    ap.add_argument("--progress-every", type=float, default=10.0, help="진행 상황 출력 주기(초), 0이면 끔")
+    args = ap.parse_args(argv)
+
+    if args.threads:
+        from inference import set_torch_threads
+        set_torch_threads(args.threads)
+    print(json.dumps(run(args), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
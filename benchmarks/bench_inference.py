@@ -0,0 +1,147 @@
+# benchmarks/bench_inference.py
+# 추론 페이지 단계별 벤치마크 (네트워크/모델 파일 불필요)
+# 합성 이미지(해상도 x 포맷)를 만들어 페이지와 같은 단계로 처리하고 단계별 p50/p95/p99를 기록한다.
+#   decode_legacy / convert_legacy : load_pil_from_bytes + np.array 왕복 (이전 경로)
+#   decode_fast                    : decode_for_model (축소 디코드 1회)
+#   preview                        : make_preview
+#   predict                        : 대역 learner의 predict_batch 직접 호출 (워커 대기 시간 제외)
+#   (concurrent)                   : 동시 요청을 BatchingWorker로 처리한 처리량 / 배치 통계
+#   render_probs / render_content  : 확률 패널 HTML / 라벨 콘텐츠 조각
+#
+#   python benchmarks/bench_inference.py --sizes 640x480 1920x1080 4032x3024 --formats jpeg png webp --vocab 300
+#   python benchmarks/bench_inference.py -o bench.json                      # 결과 저장
+#   python benchmarks/bench_inference.py --baseline bench.json --tolerance 0.2  # p50이 20% 넘게 느려지면 종료 코드 1
+import argparse, json, sys, time
+from io import BytesIO
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from backends import to_batch_array  # noqa: E402
+from inference import BatchingWorker  # noqa: E402
+from label_content import LabelContentStore  # noqa: E402
+from preprocess import decode_for_model, load_pil_from_bytes, make_preview, model_input_size  # noqa: E402
+from prob_panel import render_prob_html  # noqa: E402
+from timing import StageTimer  # noqa: E402
+
+
+class StandInLearner:
+    """fastai Learner 대역: dls.vocab, dls.after_item(Resize.size)와 배치 추론만 흉내낸다.
+    Resize(중앙 crop) -> 16x16 평균 풀링 -> 선형층 -> softmax."""
+
+    def __init__(self, vocab_size: int = 3, size: int = 224, seed: int = 0):
+        resize = SimpleNamespace(size=(size, size), method="crop", pad_mode="reflection")
+        self.dls = SimpleNamespace(vocab=[f"class_{i}" for i in range(vocab_size)],
+                                   after_item=SimpleNamespace(fs=[resize]))
+        self.spec = {"size": [size, size], "method": "crop", "pad_mode": "reflection"}
+        self.pool = max(1, size // 16)
+        self.W = np.random.default_rng(seed).standard_normal((3 * 16 * 16, vocab_size)).astype(np.float32) / 255
+
+    def predict_batch(self, items) -> np.ndarray:
+        x = to_batch_array(items, self.spec)  # (N, 3, s, s)
+        n, c, h, w = x.shape
+        p = self.pool
+        x = x[:, :, :h - h % p, :w - w % p].reshape(n, c, h // p, p, w // p, p).mean((3, 5))
+        logits = x.reshape(n, -1)[:, :self.W.shape[0]] @ self.W[:c * (h // p) * (w // p)]
+        e = np.exp(logits - logits.max(1, keepdims=True))
+        return e / e.sum(1, keepdims=True)
+
+
+def synthetic_image(w: int, h: int, fmt: str, seed: int = 0) -> bytes:
+    """그라디언트 + 노이즈 합성 이미지 (압축률이 사진과 비슷하도록 노이즈를 섞음)."""
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:h, 0:w]
+    base = np.stack([xx * 255 / max(1, w - 1), yy * 255 / max(1, h - 1), (xx + yy) * 127 / max(1, w + h - 2)], -1)
+    arr = np.clip(base + rng.normal(0, 12, base.shape), 0, 255).astype(np.uint8)
+    out = BytesIO()
+    Image.fromarray(arr).save(out, format=fmt.upper(), **({"quality": 90} if fmt.lower() in ("jpeg", "webp") else {}))
+    return out.getvalue()
+
+
+def run(args) -> dict:
+    learner = StandInLearner(args.vocab, args.target)
+    labels = [str(x) for x in learner.dls.vocab]
+    target = model_input_size(learner)
+    store = LabelContentStore(args.manifest) if Path(args.manifest).exists() else None
+    if store: store.bind_vocab(labels, persist=False)  # 대역 vocab을 manifest에 기록하지 않음
+    results = {}
+    for size in args.sizes:
+        w, h = (int(v) for v in size.lower().split("x"))
+        for fmt in args.formats:
+            b = synthetic_image(w, h, fmt)
+            timer = StageTimer()
+            t_all = time.perf_counter()
+            for _ in range(args.repeats):
+                with timer.span("decode_legacy"): pil = load_pil_from_bytes(b)
+                with timer.span("convert_legacy"): Image.fromarray(np.array(pil))
+                with timer.span("decode_fast"): x = decode_for_model(b, target)
+                with timer.span("preview"): make_preview(b)
+                with timer.span("predict"): probs = learner.predict_batch([x])[0]
+                with timer.span("render_probs"): render_prob_html(labels, probs, args.topk, labels[int(probs.argmax())])
+                if store:
+                    with timer.span("render_content"): store.fragment(labels[int(probs.argmax())])
+            elapsed = time.perf_counter() - t_all
+            results[f"{w}x{h}/{fmt}"] = {"bytes": len(b), "images_per_s": round(args.repeats / elapsed, 2),
+                                         "stages": timer.summary()}
+    # 동시 요청 처리량: 여러 요청을 한꺼번에 넣어 마이크로배칭 효과 측정 (워커는 여기서만 사용)
+    x = decode_for_model(synthetic_image(640, 480, "jpeg"), target)
+    worker = BatchingWorker(learner.predict_batch, max_batch_size=args.batch, max_wait_ms=args.wait_ms)
+    try:
+        t0 = time.perf_counter()
+        futs = [worker.submit(x) for _ in range(args.concurrent)]
+        for f in futs: f.result()
+        dt = time.perf_counter() - t0
+        concurrent = {"requests": args.concurrent, "images_per_s": round(args.concurrent / dt, 2),
+                      "worker": worker.stats()}
+    finally:
+        worker.close(5)
+    return {"config": {k: v for k, v in vars(args).items() if k not in ("baseline", "output")},
+            "results": results, "concurrent": concurrent}
+
+
+def regressions(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """baseline 대비 p50이 (1 + tolerance)배를 넘은 단계 목록."""
+    out = []
+    for case, cur in current["results"].items():
+        base = baseline.get("results", {}).get(case)
+        if not base: continue
+        for stage, s in cur["stages"].items():
+            b = base["stages"].get(stage)
+            if b and b["p50_ms"] > 0 and s["p50_ms"] > b["p50_ms"] * (1 + tolerance):
+                out.append(f"{case} {stage}: p50 {b['p50_ms']:.3f} -> {s['p50_ms']:.3f} ms")
+    return out
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="추론 페이지 단계별 지연 시간 벤치마크 (오프라인)")
+    ap.add_argument("--sizes", nargs="+", default=["640x480", "1920x1080", "4032x3024"])
+    ap.add_argument("--formats", nargs="+", default=["jpeg", "png", "webp"])
+    ap.add_argument("--vocab", type=int, default=3, help="대역 learner의 라벨 수")
+    ap.add_argument("--target", type=int, default=224, help="모델 입력 크기")
+    ap.add_argument("--topk", type=int, default=10)
+    ap.add_argument("--repeats", type=int, default=10)
+    ap.add_argument("--batch", type=int, default=8)
+    ap.add_argument("--wait-ms", type=float, default=10.0, help="동시 요청 구간의 워커 최대 대기 시간")
+    ap.add_argument("--concurrent", type=int, default=64)
+    ap.add_argument("--manifest", default=str(ROOT / "content" / "manifest.json"))
+    ap.add_argument("-o", "--output", help="결과 JSON 저장 경로")
+    ap.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="허용 p50 증가율 (0.2 = 20%%)")
+    args = ap.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output: Path(args.output).write_text(text, "utf-8")
+    print(text)
+    if args.baseline:
+        bad = regressions(report, json.loads(Path(args.baseline).read_text("utf-8")), args.tolerance)
+        for line in bad: print(f"[regression] {line}", file=sys.stderr)
+        if bad: raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_prob_panel.py
+# 확률 패널 렌더링 비용: 이전 방식(전체 정렬 + 클래스당 st.markdown 1회) vs top-k(argpartition) 단일 요소
+#
+#   python benchmarks/bench_prob_panel.py --sizes 3 30 300 3000 --k 10
+#   python benchmarks/bench_prob_panel.py --streamlit   # streamlit AppTest로 스크립트 실행 시간까지 측정
+import argparse, json, sys, time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from prob_panel import render_prob_html  # noqa: E402
+
+
+def legacy_cards(labels, probs, highlight=None) -> list[str]:
+    """이전 streamlit_app.py 방식: 전체 (라벨, 확률) 리스트 정렬 후 클래스마다 HTML 한 덩어리(= st.markdown 1회)."""
+    prob_list = sorted([(labels[i], float(probs[i])) for i in range(len(labels))], key=lambda x: x[1], reverse=True)
+    out = []
+    for lbl, p in prob_list:
+        pct = p * 100
+        hi = "highlight" if lbl == highlight else ""
+        out.append(f"""
+                <div class="prob-card">
+                  <div style="display:flex;justify-content:space-between;margin-bottom:6px;">
+                    <strong>{lbl}</strong><span>{pct:.2f}%</span>
+                  </div>
+                  <div class="prob-bar-bg">
+                    <div class="prob-bar-fg {hi}" style="width:{pct:.4f}%;"></div>
+                  </div>
+                </div>
+                """)
+    return out
+
+
+def _best_ms(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def _apptest_ms(n: int, k: int, mode: str, repeats: int) -> float:
+    """streamlit AppTest로 패널 스크립트 한 번 실행하는 시간 (요소 생성/직렬화 포함)."""
+    from streamlit.testing.v1 import AppTest
+
+    def script(n, k, mode):
+        import numpy as np
+        import streamlit as st
+        from benchmarks.bench_prob_panel import legacy_cards
+        from prob_panel import render_prob_html
+        labels = [f"class_{i}" for i in range(n)]
+        probs = np.random.default_rng(0).dirichlet(np.ones(n))
+        if mode == "legacy":
+            for html in legacy_cards(labels, probs):
+                st.markdown(html, unsafe_allow_html=True)
+        else:
+            st.markdown(render_prob_html(labels, probs, k), unsafe_allow_html=True)
+
+    at = AppTest.from_function(script, kwargs={"n": n, "k": k, "mode": mode}, default_timeout=120)
+    return _best_ms(at.run, repeats)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="확률 패널 렌더링 벤치마크 (vocab 크기별)")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[3, 30, 300, 1000, 3000])
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--repeats", type=int, default=20)
+    ap.add_argument("--streamlit", action="store_true", help="streamlit AppTest 실행 시간도 측정")
+    args = ap.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    rows = []
+    for n in args.sizes:
+        labels = [f"class_{i}" for i in range(n)]
+        probs = rng.dirichlet(np.ones(n)).astype(np.float32)
+        legacy = legacy_cards(labels, probs)
+        topk = render_prob_html(labels, probs, args.k)
+        row = {
+            "vocab": n,
+            "legacy_elements": len(legacy),
+            "topk_elements": 1,
+            "legacy_bytes": sum(len(h.encode("utf-8")) for h in legacy),
+            "topk_bytes": len(topk.encode("utf-8")),
+            "legacy_build_ms": round(_best_ms(lambda: legacy_cards(labels, probs), args.repeats), 3),
+            "topk_build_ms": round(_best_ms(lambda: render_prob_html(labels, probs, args.k), args.repeats), 3),
+        }
+        if args.streamlit:
+            reps = max(1, args.repeats // 5)
+            row["legacy_streamlit_ms"] = round(_apptest_ms(n, args.k, "legacy", reps), 2)
+            row["topk_streamlit_ms"] = round(_apptest_ms(n, args.k, "topk", reps), 2)
+        rows.append(row)
+    print(json.dumps({"k": args.k, "results": rows}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
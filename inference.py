@@ -0,0 +1,130 @@
+# inference.py
+# 세션 간 마이크로배칭 추론 워커
+# 모든 세션의 요청을 하나의 백그라운드 스레드가 모아 배치 forward pass 한 번으로 처리한다.
+import queue, threading, time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+from timing import percentile
+
+_STOP = object()
+
+
+def set_torch_threads(intra: int | None = None, interop: int | None = None) -> tuple[int, int]:
+    """PyTorch intra-op / inter-op 스레드 수 지정 (0/None이면 기본값 유지)."""
+    import torch
+    if intra: torch.set_num_threads(int(intra))
+    if interop:
+        try:
+            torch.set_num_interop_threads(int(interop))
+        except RuntimeError:
+            pass  # 병렬 작업이 이미 시작된 프로세스에서는 변경할 수 없음
+    return torch.get_num_threads(), torch.get_num_interop_threads()
+
+
+def fastai_predict_batch(learner, items: list) -> np.ndarray:
+    """fastai Learner로 배치 추론. 반환: (N, C) 확률 (learner.predict의 probs와 동일한 활성화)."""
+    dl = learner.dls.test_dl(items, bs=len(items), num_workers=0)
+    with learner.no_bar():
+        probs, _ = learner.get_preds(dl=dl)
+    return probs.detach().cpu().numpy()
+
+
+class BatchingWorker:
+    """요청을 max_batch_size 또는 max_wait_ms 중 먼저 도달하는 조건까지 모아 predict_batch 한 번으로 처리."""
+
+    def __init__(self, predict_batch, max_batch_size: int = 8, max_wait_ms: float = 10.0,
+                 name: str = "inference-worker", window: int = 1024):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000
+        self._q: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batch_sizes: Counter = Counter()
+        self._queue_wait_ms: deque = deque(maxlen=window)
+        self._batch_ms: deque = deque(maxlen=window)
+        self.requests = self.batches = self.errors = self.max_queue_depth = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        fut: Future = Future()
+        self._q.put((item, fut, time.perf_counter()))
+        depth = self._q.qsize()
+        with self._lock:
+            self.requests += 1
+            self.max_queue_depth = max(self.max_queue_depth, depth)
+        return fut
+
+    def predict(self, item, timeout: float | None = None) -> np.ndarray:
+        """단일 항목 추론 (배치에 합류한 뒤 결과가 나올 때까지 대기)."""
+        return self.submit(item).result(timeout)
+
+    def close(self, timeout: float | None = None):
+        self._q.put(_STOP)
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._lock:
+            n = sum(self._batch_sizes.values())
+            return {
+                "queue_depth": self._q.qsize(),
+                "max_queue_depth": self.max_queue_depth,
+                "requests": self.requests,
+                "batches": self.batches,
+                "errors": self.errors,
+                "mean_batch_size": sum(k * v for k, v in self._batch_sizes.items()) / n if n else 0.0,
+                "batch_size_hist": dict(sorted(self._batch_sizes.items())),
+                "queue_wait_ms_p50": percentile(self._queue_wait_ms, 50),
+                "queue_wait_ms_p99": percentile(self._queue_wait_ms, 99),
+                "batch_ms_p50": percentile(self._batch_ms, 50),
+                "batch_ms_p99": percentile(self._batch_ms, 99),
+            }
+
+    def _run(self):
+        while True:
+            first = self._q.get()
+            if first is _STOP: return
+            batch, stop = [first], False
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    nxt = self._q.get(timeout=remaining) if remaining > 0 else self._q.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is _STOP:
+                    stop = True
+                    break
+                batch.append(nxt)
+            try:
+                self._run_batch(batch)
+            except Exception as e:
+                # 워커 스레드가 죽으면 프로세스 전체의 요청이 영원히 대기하므로, 남은 future를 실패시키고 계속 실행
+                with self._lock: self.errors += 1
+                for _, fut, _ in batch:
+                    if not fut.done(): fut.set_exception(e)
+            if stop: return
+
+    def _run_batch(self, batch):
+        batch = [b for b in batch if b[1].set_running_or_notify_cancel()]
+        if not batch: return
+        t0 = time.perf_counter()
+        try:
+            probs = self.predict_batch([item for item, _, _ in batch])
+            if len(probs) != len(batch):
+                raise RuntimeError(f"predict_batch가 {len(batch)}개 요청에 {len(probs)}개 결과를 반환했습니다.")
+            rows = [np.array(p) for p in probs]  # 복사: 행 view가 배치 배열 전체를 붙잡지 않도록
+        except Exception as e:
+            with self._lock: self.errors += 1
+            for _, fut, _ in batch: fut.set_exception(e)
+            return
+        t1 = time.perf_counter()
+        with self._lock:
+            self.batches += 1
+            self._batch_sizes[len(batch)] += 1
+            self._batch_ms.append((t1 - t0) * 1000)
+            self._queue_wait_ms.extend((t0 - ts) * 1000 for _, _, ts in batch)
+        for (_, fut, _), row in zip(batch, rows): fut.set_result(row)
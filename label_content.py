@@ -0,0 +1,311 @@
+# label_content.py
+# 라벨별 콘텐츠 저장소
+# - 외부 manifest(JSON) + 에셋 디렉터리에서 로드, 라벨 이름으로 조회
+# - 로컬/데이터 URI 이미지는 한 번만 카드 너비에 맞춘 썸네일 파일로 만들어 Streamlit 정적 경로(static/)로 제공
+#   -> HTML 조각에는 URL만 들어가고, 이미지는 브라우저가 한 번 받아 캐시한다 (enableStaticServing 필요)
+# - 라벨별 HTML 조각(텍스트 카드 / 이미지 그리드 / 동영상 카드)을 미리 만들어 메모이즈
+# - manifest 파일이 바뀌면(mtime/크기) 자동으로 다시 로드
+#
+# manifest 형식:
+#   {"version": 1,
+#    "labels":   {"<라벨 이름>": {"texts": [...], "images": [...], "videos": [...]}},
+#    "by_index": [{...}, ...]}   # (이전 방식) vocab 위치 기준. 조회에는 쓰지 않고, 첫 로드 때 모델 vocab 순서로
+#                                #  labels의 이름 키로 옮겨 manifest에 기록한다 (LabelContentStore.bind_vocab)
+# images 항목은 manifest 파일이 있는 폴더 기준 상대 경로, http(s) URL 또는 data URI.
+import argparse, base64, hashlib, json, logging, os, re, threading
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageOps
+
+log = logging.getLogger(__name__)
+
+APP_DIR = Path(__file__).resolve().parent
+DEFAULT_MANIFEST = APP_DIR / "content" / "manifest.json"
+STATIC_DIR = APP_DIR / "static"   # Streamlit 정적 파일 폴더 (.streamlit/config.toml: enableStaticServing)
+STATIC_URL = "app/static"
+# 이미지 카드 너비: wide 레이아웃 절반 컬럼의 4/12 ≈ 220px, 고해상도 화면(2x)까지 고려
+CARD_IMAGE_WIDTH = 440
+MAX_ITEMS = 3
+
+
+def yt_id_from_url(url: str) -> str | None:
+    if not url: return None
+    pats = [r"(?:v=|/)([0-9A-Za-z_-]{11})(?:\?|&|/|$)", r"youtu\.be/([0-9A-Za-z_-]{11})"]
+    for p in pats:
+        m = re.search(p, url)
+        if m: return m.group(1)
+    return None
+
+
+def yt_thumb(url: str) -> str | None:
+    vid = yt_id_from_url(url)
+    return f"https://img.youtube.com/vi/{vid}/hqdefault.jpg" if vid else None
+
+
+def pick_top3(lst):
+    return [x for x in lst if isinstance(x, str) and x.strip()][:MAX_ITEMS]
+
+
+def resolve_manifest(path: str | os.PathLike | None) -> Path:
+    """상대 경로는 작업 디렉터리가 아니라 앱 폴더 기준으로 해석."""
+    p = Path(path) if path else DEFAULT_MANIFEST
+    return p if p.is_absolute() else APP_DIR / p
+
+
+def make_thumbnail(raw: bytes, width: int = CARD_IMAGE_WIDTH, quality: int = 82) -> tuple[bytes, str]:
+    """카드 너비에 맞춘 썸네일 (바이트, 확장자). 재인코딩이 더 크면 원본을 그대로 쓴다."""
+    pil = Image.open(BytesIO(raw))
+    ext = {"JPEG": ".jpg", "PNG": ".png", "WEBP": ".webp", "GIF": ".gif"}.get(pil.format, ".jpg")
+    pil = ImageOps.exif_transpose(pil)
+    if pil.mode != "RGB": pil = pil.convert("RGB")
+    if pil.width > width:
+        pil = pil.resize((width, max(1, round(pil.height * width / pil.width))), Image.LANCZOS)
+    out = BytesIO()
+    pil.save(out, format="JPEG", quality=quality, optimize=True)
+    if out.tell() >= len(raw): return raw, ext
+    return out.getvalue(), ".jpg"
+
+
+def _data_uri(raw: bytes) -> str:
+    mime = Image.MIME.get(Image.open(BytesIO(raw)).format, "image/jpeg")
+    return f"data:{mime};base64,{base64.b64encode(raw).decode('ascii')}"
+
+
+def render_fragment(texts, images, videos) -> str:
+    """라벨 콘텐츠 -> 한 번의 st.markdown으로 보낼 HTML 조각. (들여쓰기/빈 줄이 있으면 markdown이 코드로 처리)"""
+    parts = []
+    if texts:
+        parts.append('<div class="info-grid">' + "".join(
+            f'<div class="card" style="grid-column:span 12;"><h4>텍스트</h4><div>{t}</div></div>'
+            for t in texts) + "</div>")
+    if images:
+        parts.append('<div class="info-grid">' + "".join(
+            f'<div class="card" style="grid-column:span 4;"><h4>이미지</h4><img src="{src}" class="thumb" loading="lazy" /></div>'
+            for src in images) + "</div>")
+    if videos:
+        cards = []
+        for v in videos:
+            thumb = yt_thumb(v)
+            if thumb:
+                cards.append(f'<div class="card" style="grid-column:span 6;"><h4>동영상</h4>'
+                             f'<a href="{v}" target="_blank" class="thumb-wrap"><img src="{thumb}" class="thumb"/>'
+                             f'<div class="play"></div></a><div class="helper">{v}</div></div>')
+            else:
+                cards.append(f'<div class="card" style="grid-column:span 6;"><h4>동영상</h4>'
+                             f'<a href="{v}" target="_blank">{v}</a></div>')
+        parts.append('<div class="info-grid">' + "".join(cards) + "</div>")
+    return "".join(parts)
+
+
+def assign_by_index(manifest: dict, vocab: list[str]) -> list[str]:
+    """by_index(위치 기준) 항목을 vocab 순서의 라벨 이름 키(labels)로 옮긴다 (manifest를 제자리에서 수정).
+    이미 이름 키가 있는 라벨은 덮어쓰지 않는다. 반환: 옮긴 라벨 이름 목록"""
+    by_index = manifest.get("by_index") or []
+    if len(by_index) > len(vocab):
+        raise ValueError(f"by_index 항목({len(by_index)}개)이 모델 vocab({len(vocab)}개)보다 많아 "
+                         f"라벨 이름에 대응시킬 수 없습니다. manifest의 labels에 이름으로 옮기세요.")
+    labels = manifest.setdefault("labels", {})
+    moved = []
+    for name, entry in zip(vocab, by_index):
+        if name not in labels:
+            labels[name] = entry
+            moved.append(name)
+    manifest.pop("by_index", None)
+    return moved
+
+
+def write_manifest(path: Path, manifest: dict):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, ensure_ascii=False, indent=2) + "\n", "utf-8")
+    os.replace(tmp, path)
+
+
+class LabelContentStore:
+    """manifest 기반 라벨 콘텐츠 저장소. 조각/썸네일/전송 크기 보고는 manifest가 바뀔 때까지 메모이즈 (세션 간 공유 가능).
+    조회는 라벨 이름으로만 한다. by_index(위치 기준) 항목은 bind_vocab()으로 모델 vocab을 알려 주면
+    그 순서대로 이름 키로 옮기고 (persist=True면) manifest에 기록한다."""
+
+    def __init__(self, manifest_path: str | os.PathLike | None = None, static_dir: str | os.PathLike = STATIC_DIR,
+                 static_url: str = STATIC_URL, image_width: int = CARD_IMAGE_WIDTH):
+        self.manifest_path = resolve_manifest(manifest_path)
+        self.static_dir = Path(static_dir)
+        self.static_url = static_url.rstrip("/")
+        self.image_width = image_width
+        self._lock = threading.Lock()
+        self._sig = False  # 아직 읽지 않음 (None은 "파일 없음")
+        self._manifest: dict = {}
+        self._fragments: dict = {}
+        self._thumbs: dict = {}
+        self._thumb_bytes: dict = {}
+        self._reports: dict = {}
+        self._vocab: list[str] | None = None
+        self._persist = True
+        self._notices: list[str] = []
+        self.error: str | None = None
+
+    @property
+    def missing(self) -> bool:
+        return not self.manifest_path.exists()
+
+    def bind_vocab(self, vocab, persist: bool = True):
+        """모델 vocab을 알려 준다 (바뀌었을 때만 manifest를 다시 읽어 by_index를 이름 키로 옮김)."""
+        vocab = [str(x) for x in vocab]
+        with self._lock:
+            if vocab == self._vocab and persist == self._persist: return
+            self._vocab, self._persist, self._sig = vocab, persist, False
+            self._refresh()
+
+    def pop_notices(self) -> list[str]:
+        """by_index 이전 등 한 번만 알릴 메시지."""
+        with self._lock:
+            out, self._notices = self._notices, []
+        return out
+
+    def _signature(self):
+        try:
+            st = self.manifest_path.stat()
+            return st.st_mtime_ns, st.st_size
+        except FileNotFoundError:
+            return None
+
+    def _refresh(self):
+        sig = self._signature()
+        if sig == self._sig: return
+        self.error = None
+        if sig is None:
+            log.warning("라벨 콘텐츠 manifest가 없습니다: %s", self.manifest_path)
+            manifest = {}
+        else:
+            manifest = json.loads(self.manifest_path.read_text("utf-8"))
+        if manifest.get("by_index") and self._vocab is not None:
+            sig = self._assign_names(manifest, sig)
+        self._manifest, self._sig = manifest, sig
+        self._fragments.clear()
+        self._thumbs.clear()
+        self._thumb_bytes.clear()
+        self._reports.clear()
+
+    def _assign_names(self, manifest: dict, sig):
+        """by_index -> labels. 기록하면 새 시그니처를, 아니면 원래 시그니처를 반환."""
+        try:
+            moved = assign_by_index(manifest, self._vocab)
+        except ValueError as e:
+            self.error = str(e)
+            log.error("%s (%s)", e, self.manifest_path)
+            manifest.pop("by_index", None)  # 위치로는 절대 조회하지 않음
+            return sig
+        msg = f"위치 기준(by_index) 라벨 콘텐츠 {len(moved)}개를 모델 vocab 이름으로 옮겼습니다: {', '.join(moved)}"
+        if self._persist:
+            try:
+                write_manifest(self.manifest_path, manifest)
+                sig = self._signature()
+                msg += f" — `{self.manifest_path}`에 기록했습니다."
+            except OSError as e:
+                msg += f" — manifest에 기록하지 못해 이 프로세스에서만 적용됩니다 ({e})."
+        log.warning(msg)
+        self._notices.append(msg)
+        return sig
+
+    def label_names(self) -> list[str]:
+        with self._lock:
+            self._refresh()
+            return list(self._manifest.get("labels", {}))
+
+    def _entry(self, label: str) -> dict:
+        return self._manifest.get("labels", {}).get(label, {})
+
+    def _image_bytes(self, ref: str) -> bytes | None:
+        if ref.startswith("data:"): return base64.b64decode(ref.split(",", 1)[1])
+        if ref.startswith(("http://", "https://")): return None
+        return (self.manifest_path.parent / ref).read_bytes()
+
+    def _image_src(self, ref: str) -> str:
+        """로컬/데이터 URI 이미지 -> static/thumbs/의 썸네일 URL (내용 해시로 이름을 지어 변경 시 자동 갱신)."""
+        if ref not in self._thumbs:
+            raw = self._image_bytes(ref)
+            if raw is None:
+                self._thumbs[ref] = ref  # 원격 이미지는 브라우저가 직접 받음
+            else:
+                data, ext = make_thumbnail(raw, self.image_width)
+                name = f"{hashlib.sha256(raw).hexdigest()[:16]}_w{self.image_width}{ext}"
+                path = self.static_dir / "thumbs" / name
+                if not path.exists():
+                    path.parent.mkdir(parents=True, exist_ok=True)
+                    tmp = path.with_name(path.name + ".tmp")
+                    tmp.write_bytes(data)
+                    os.replace(tmp, path)
+                self._thumbs[ref] = f"{self.static_url}/thumbs/{name}"
+                self._thumb_bytes[ref] = len(data)
+        return self._thumbs[ref]
+
+    def content(self, label: str):
+        """(texts, images, videos) — 각 최대 3개. images는 원본 참조 그대로."""
+        with self._lock:
+            self._refresh()
+            cfg = self._entry(label)
+        return (pick_top3(cfg.get("texts", [])), pick_top3(cfg.get("images", [])),
+                pick_top3(cfg.get("videos", [])))
+
+    def fragment(self, label: str) -> str:
+        """라벨의 HTML 조각 (콘텐츠가 없으면 빈 문자열)."""
+        with self._lock:
+            self._refresh()
+            return self._fragment(label)
+
+    def _fragment(self, label: str) -> str:
+        if label not in self._fragments:
+            cfg = self._entry(label)
+            self._fragments[label] = render_fragment(
+                pick_top3(cfg.get("texts", [])),
+                [self._image_src(x) for x in pick_top3(cfg.get("images", []))],
+                pick_top3(cfg.get("videos", [])))
+        return self._fragments[label]
+
+    def payload_report(self, labels: list[str]) -> dict:
+        """라벨별 전송 크기 (bytes). manifest가 바뀔 때까지 라벨 목록별로 한 번만 계산한다.
+        before_per_rerun: 이전 방식 — 원본 이미지를 base64로 인라인한 HTML (재실행/라벨 전환마다 전송)
+        after_per_rerun:  현재 조각 — 이미지 URL만 포함 (재실행/라벨 전환마다 전송)
+        images_first_load: 썸네일 파일 크기 — 브라우저가 처음 한 번만 받고 캐시"""
+        key = tuple(labels)
+        with self._lock:
+            self._refresh()
+            if key in self._reports: return self._reports[key]
+            report = {}
+            for label in labels:
+                cfg = self._entry(label)
+                texts, images, videos = (pick_top3(cfg.get(k, [])) for k in ("texts", "images", "videos"))
+                after = self._fragment(label)
+                raws = {x: self._image_bytes(x) for x in images}
+                before = render_fragment(texts, [_data_uri(raws[x]) if raws[x] else x for x in images], videos)
+                report[label] = {"before_per_rerun": len(before.encode("utf-8")),
+                                 "after_per_rerun": len(after.encode("utf-8")),
+                                 "images_first_load": sum(self._thumb_bytes.get(x, 0) for x in images)}
+            report["total"] = {k: sum(v[k] for v in report.values())
+                               for k in ("before_per_rerun", "after_per_rerun", "images_first_load")}
+            self._reports[key] = report
+            return report
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="라벨 콘텐츠 조각의 전송 크기 측정 / by_index -> 라벨 이름 이전")
+    ap.add_argument("manifest", nargs="?", default=str(DEFAULT_MANIFEST))
+    ap.add_argument("--labels", nargs="*", help="측정할 라벨 (기본: manifest의 라벨 이름)")
+    ap.add_argument("--vocab", nargs="+", help="모델 vocab (learner.dls.vocab 순서). by_index 항목을 이 이름들로 대응")
+    ap.add_argument("--migrate", action="store_true", help="--vocab으로 대응시킨 결과를 manifest에 기록")
+    args = ap.parse_args(argv)
+    path = resolve_manifest(args.manifest)
+    if not path.exists(): raise SystemExit(f"manifest가 없습니다: {path}")
+    if args.migrate and not args.vocab: raise SystemExit("--migrate에는 --vocab이 필요합니다.")
+    store = LabelContentStore(path)
+    if args.vocab: store.bind_vocab(args.vocab, persist=args.migrate)
+    for msg in store.pop_notices(): print(msg)
+    if store.error: raise SystemExit(store.error)
+    labels = args.labels or store.label_names()
+    if not labels and json.loads(path.read_text("utf-8")).get("by_index"):
+        raise SystemExit("manifest에 위치 기준(by_index) 항목만 있습니다. --vocab으로 라벨 이름을 지정하세요.")
+    print(json.dumps(store.payload_report(labels), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
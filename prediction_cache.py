@@ -0,0 +1,84 @@
+# prediction_cache.py
+# 예측 결과 캐시: (모델 지문 + 이미지 바이트 해시) -> 예측 결과
+# Streamlit 재실행/세션이 달라도 같은 이미지면 forward pass를 다시 돌리지 않는다.
+import hashlib, os, threading, time
+from collections import OrderedDict
+
+
+def image_key(b: bytes) -> str:
+    """이미지 바이트의 내용 해시."""
+    return hashlib.sha256(b).hexdigest()
+
+
+def model_fingerprint(vocab, weights_path: str | None = None) -> str:
+    """vocab 순서 + 가중치 파일 내용으로 모델 지문 생성. 모델이 바뀌면 캐시 키도 바뀐다."""
+    h = hashlib.sha256()
+    h.update("\x1f".join(str(v) for v in vocab).encode("utf-8"))
+    if weights_path and os.path.exists(weights_path):
+        with open(weights_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+    return h.hexdigest()[:16]
+
+
+class PredictionCache:
+    """스레드 안전 LRU 캐시. 항목 수/메모리 상한, 선택적 TTL, 적중/미스 카운터."""
+
+    def __init__(self, max_items: int = 512, ttl: float | None = None, max_bytes: int | None = None):
+        self.max_items = max(1, int(max_items))
+        self.ttl = float(ttl) if ttl else None
+        self.max_bytes = int(max_bytes) if max_bytes else None
+        self._data: OrderedDict[str, tuple[object, int, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key: str):
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None and item[2] is not None and item[2] < time.monotonic():
+                self._drop(key)
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return item[0]
+
+    def put(self, key: str, value, nbytes: int = 0):
+        nbytes = max(0, int(nbytes))
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return  # 단일 항목이 상한보다 크면 캐시하지 않음
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = (value, nbytes, expires)
+            self._bytes += nbytes
+            while len(self._data) > self.max_items or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                self._drop(next(iter(self._data)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "items": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+    def _drop(self, key: str):
+        _, nbytes, _ = self._data.pop(key)
+        self._bytes -= nbytes
@@ -0,0 +1,54 @@
+# preprocess.py
+# 이미지 디코딩/전처리
+# - load_pil_from_bytes: 기존 경로 (원본 해상도 전체 디코드)
+# - decode_for_model: 모델 입력 크기를 알면 JPEG draft 모드 / 정수배 축소로 한 번만 디코드
+# - make_preview: UI 표시용 축소 JPEG
+from io import BytesIO
+
+from PIL import Image, ImageOps
+
+PREVIEW_MAX_SIDE = 640
+
+
+def load_pil_from_bytes(b: bytes) -> Image.Image:
+    pil = Image.open(BytesIO(b))
+    pil = ImageOps.exif_transpose(pil)
+    if pil.mode != "RGB": pil = pil.convert("RGB")
+    return pil
+
+
+def model_input_size(learner) -> tuple[int, int] | None:
+    """learner.dls의 item 변환(Resize 등)에서 모델 입력 크기 추출. 찾지 못하면 None."""
+    fs = getattr(getattr(learner.dls, "after_item", None), "fs", None) or []
+    for tfm in fs:
+        size = getattr(tfm, "size", None)
+        if size is None: continue
+        return (int(size), int(size)) if isinstance(size, int) else tuple(int(x) for x in size)
+    return None
+
+
+def decode_for_model(b: bytes, target: tuple[int, int] | None = None) -> Image.Image:
+    """RGB PIL 이미지로 한 번만 디코드. target이 있으면 짧은 변이 max(target) 이상인 범위에서 축소 디코드."""
+    pil = Image.open(BytesIO(b))
+    t = max(target) if target else 0
+    if t and pil.format == "JPEG":
+        # EXIF 회전 전이라 가로/세로가 바뀔 수 있으므로 정사각형으로 요청
+        pil.draft("RGB", (t, t))
+    pil = ImageOps.exif_transpose(pil)
+    if pil.mode != "RGB": pil = pil.convert("RGB")
+    if t:
+        factor = min(pil.size) // t
+        if factor >= 2: pil = pil.reduce(factor)
+    return pil
+
+
+def make_preview(b: bytes, max_side: int = PREVIEW_MAX_SIDE, quality: int = 85) -> bytes:
+    """브라우저로 보낼 축소 미리보기 (JPEG 바이트)."""
+    pil = Image.open(BytesIO(b))
+    if pil.format == "JPEG": pil.draft("RGB", (max_side, max_side))
+    pil = ImageOps.exif_transpose(pil)
+    if pil.mode != "RGB": pil = pil.convert("RGB")
+    pil.thumbnail((max_side, max_side), Image.LANCZOS)
+    out = BytesIO()
+    pil.save(out, format="JPEG", quality=quality)
+    return out.getvalue()
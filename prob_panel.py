@@ -0,0 +1,49 @@
+# prob_panel.py
+# 상세 예측 확률 패널
+# - np.argpartition으로 상위 k개만 골라 정렬 (O(n) 선택 + O(k log k) 정렬), 나머지는 "기타" 한 줄로 합산
+# - 전체 패널을 한 번의 st.markdown(HTML) 또는 plotly 차트 하나로 렌더링
+from html import escape
+
+import numpy as np
+
+
+def top_k(probs, k: int = 0) -> tuple[np.ndarray, float, int]:
+    """확률 상위 k개 인덱스(내림차순), 나머지 확률 합, 나머지 개수. k<=0 또는 k>=n이면 전체."""
+    p = np.asarray(probs, dtype=np.float64).reshape(-1)
+    n = p.shape[0]
+    if k <= 0 or k >= n:
+        return np.argsort(-p, kind="stable"), 0.0, 0
+    idx = np.argpartition(-p, k - 1)[:k]
+    idx = idx[np.argsort(-p[idx], kind="stable")]
+    return idx, float(p.sum() - p[idx].sum()), n - k
+
+
+def _bar(label: str, pct: float, cls: str = "") -> str:
+    return (f'<div class="prob-card"><div style="display:flex;justify-content:space-between;margin-bottom:6px;">'
+            f'<strong>{escape(label)}</strong><span>{pct:.2f}%</span></div>'
+            f'<div class="prob-bar-bg"><div class="prob-bar-fg {cls}" style="width:{pct:.4f}%;"></div></div></div>')
+
+
+def render_prob_html(labels, probs, k: int = 0, highlight: str | None = None) -> str:
+    """상위 k개 + 기타 버킷을 하나의 HTML 블록으로."""
+    idx, rest, n_rest = top_k(probs, k)
+    p = np.asarray(probs).reshape(-1)
+    parts = [_bar(labels[i], float(p[i]) * 100, "highlight" if labels[i] == highlight else "") for i in idx]
+    if n_rest:
+        parts.append(_bar(f"기타 ({n_rest}개)", rest * 100, "others"))
+    return "".join(parts)
+
+
+def prob_figure(labels, probs, k: int = 0, highlight: str | None = None):
+    """상위 k개 + 기타 버킷을 plotly 가로 막대 차트 하나로."""
+    import plotly.graph_objects as go
+    idx, rest, n_rest = top_k(probs, k)
+    p = np.asarray(probs).reshape(-1)
+    names = [labels[i] for i in idx] + ([f"기타 ({n_rest}개)"] if n_rest else [])
+    vals = [float(p[i]) * 100 for i in idx] + ([rest * 100] if n_rest else [])
+    colors = ["#FF6F00" if x == highlight else "#4CAF50" for x in names[:len(idx)]] + (["#B0BEC5"] if n_rest else [])
+    fig = go.Figure(go.Bar(x=vals, y=names, orientation="h", marker_color=colors,
+                           text=[f"{v:.2f}%" for v in vals], textposition="auto"))
+    fig.update_layout(yaxis={"autorange": "reversed"}, xaxis={"range": [0, 100], "title": "%"},
+                      height=max(160, 32 * len(names) + 60), margin={"l": 10, "r": 10, "t": 10, "b": 10})
+    return fig
@@ -0,0 +1,57 @@
+# timing.py
+# 단계별 지연 시간 계측: span() 컨텍스트로 측정 -> 단계별 최근 window개로 p50/p95/p99 집계 -> JSON 내보내기
+import json, threading, time
+from collections import deque
+from contextlib import contextmanager
+
+
+def percentile(xs, q: float) -> float:
+    """최근접 순위 방식 백분위수 (xs가 비어 있으면 0)."""
+    if not xs: return 0.0
+    xs = sorted(xs)
+    return float(xs[min(len(xs) - 1, int(round(q / 100 * (len(xs) - 1))))])
+
+
+class StageTimer:
+    """스레드 안전한 단계별 시간 기록기 (세션 간 공유 가능)."""
+
+    def __init__(self, window: int = 2048):
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples: dict[str, deque] = {}
+        self._counts: dict[str, int] = {}
+
+    @contextmanager
+    def span(self, stage: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - t0) * 1000)
+
+    def record(self, stage: str, ms: float):
+        with self._lock:
+            self._samples.setdefault(stage, deque(maxlen=self.window)).append(ms)
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+
+    def summary(self) -> dict:
+        """{단계: {count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms}} — 통계는 최근 window개 기준."""
+        with self._lock:
+            snap = {k: list(v) for k, v in self._samples.items()}
+            counts = dict(self._counts)
+        return {k: {"count": counts[k],
+                    "mean_ms": round(sum(v) / len(v), 3),
+                    "p50_ms": round(percentile(v, 50), 3),
+                    "p95_ms": round(percentile(v, 95), 3),
+                    "p99_ms": round(percentile(v, 99), 3),
+                    "max_ms": round(max(v), 3)}
+                for k, v in snap.items() if v}
+
+    def to_json(self, **extra) -> str:
+        return json.dumps({"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), **extra,
+                           "stages": self.summary()}, ensure_ascii=False, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
@@ -0,0 +1,162 @@
+# video.py
+# 동영상 분류: 프레임 스트리밍 디코드 + 샘플링 + 배치 추론 + 평활화된 라벨 타임라인
+# - 영상을 통째로 메모리에 올리지 않는다: 샘플링되지 않은 프레임은 grab()만 하고 디코드하지 않음
+# - 메모리 = 배치 크기만큼의 프레임 + 고정 크기 차트 버퍼(max_points x 라벨 수) + 세그먼트 합계 (영상 길이와 무관)
+import time
+
+import numpy as np
+from PIL import Image
+
+SAMPLING_MODES = ("time", "stride", "scene")
+
+
+def video_info(path) -> dict:
+    import cv2
+    cap = cv2.VideoCapture(str(path))
+    try:
+        if not cap.isOpened(): raise ValueError("동영상을 열 수 없습니다.")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        return {"fps": fps, "frames": frames, "duration_s": frames / fps if frames else None,
+                "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))}
+    finally:
+        cap.release()
+
+
+def iter_frames(path, mode: str = "time", stride: int = 30, every_sec: float = 1.0,
+                scene_threshold: float = 0.35, min_gap_sec: float = 0.5, min_side: int | None = None):
+    """샘플링된 프레임을 (프레임 번호, 시각(초), RGB PIL)로 하나씩 생성.
+    mode: time(every_sec마다) / stride(stride 프레임마다) / scene(stride 프레임마다 검사해 장면이 바뀌면)"""
+    import cv2
+    cap = cv2.VideoCapture(str(path))
+    if not cap.isOpened(): raise ValueError("동영상을 열 수 없습니다.")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    step = max(1, int(round(fps * every_sec))) if mode == "time" else max(1, int(stride))
+    prev_hist, last_t, idx = None, float("-inf"), -1
+    try:
+        while cap.grab():
+            idx += 1
+            if idx % step: continue
+            ok, frame = cap.retrieve()
+            if not ok: break
+            t = idx / fps
+            if mode == "scene":
+                small = cv2.resize(frame, (64, 36), interpolation=cv2.INTER_AREA)
+                hist = cv2.calcHist([cv2.cvtColor(small, cv2.COLOR_BGR2HSV)], [0, 1], None, [16, 8], [0, 180, 0, 256])
+                cv2.normalize(hist, hist)
+                if prev_hist is not None and (
+                    t - last_t < min_gap_sec
+                    or cv2.compareHist(prev_hist, hist, cv2.HISTCMP_BHATTACHARYYA) < scene_threshold
+                ):
+                    continue
+                prev_hist = hist
+            last_t = t
+            h, w = frame.shape[:2]
+            if min_side and min(h, w) > min_side:
+                s = min_side / min(h, w)
+                frame = cv2.resize(frame, (max(1, round(w * s)), max(1, round(h * s))), interpolation=cv2.INTER_AREA)
+            yield idx, t, Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    finally:
+        cap.release()
+
+
+class LabelTimeline:
+    """샘플별 확률을 EMA로 평활화하고, 평활 top-1이 같은 연속 구간을 세그먼트로 묶는다.
+    차트용 시계열은 max_points개 고정 버퍼에 보관: 가득 차면 인접한 두 점을 평균해 반으로 줄이고
+    이후 점 하나가 나타내는 샘플 수를 두 배로 늘린다 (샘플 수와 무관하게 메모리/전송량 일정)."""
+
+    def __init__(self, labels, smooth: int = 5, max_points: int = 512):
+        self.labels = list(labels)
+        self.alpha = 2 / (smooth + 1) if smooth > 1 else 1.0
+        self.max_points = max(2, int(max_points) // 2 * 2)
+        self.segments: list[dict] = []
+        self.n = 0
+        self._ema = None
+        self._sum = None  # 평활 확률 누적합 -> 차트에 그릴 라벨 선택
+        self._t = np.zeros(self.max_points, dtype=np.float64)
+        self._p = np.zeros((self.max_points, len(self.labels)), dtype=np.float32)
+        self._len, self._bucket = 0, 1
+        self._pend_t, self._pend_p, self._pend_n = 0.0, None, 0
+
+    def add(self, t: float, probs):
+        p = np.array(probs, dtype=np.float32).reshape(-1)
+        self._ema = p if self._ema is None else self.alpha * p + (1 - self.alpha) * self._ema
+        self.n += 1
+        self._sum = self._ema.copy() if self._sum is None else self._sum + self._ema
+        self._pend_t += t
+        self._pend_p = self._ema.copy() if self._pend_p is None else self._pend_p + self._ema
+        self._pend_n += 1
+        if self._pend_n == self._bucket: self._push()
+        top = int(self._ema.argmax())
+        label, prob = self.labels[top], float(self._ema[top])
+        seg = self.segments[-1] if self.segments else None
+        if seg and seg["label"] == label:
+            seg["end"] = t
+            seg["_sum"] += prob
+            seg["_n"] += 1
+        else:
+            if seg: seg["end"] = t
+            self.segments.append({"label": label, "start": t, "end": t, "_sum": prob, "_n": 1})
+
+    def _push(self):
+        self._t[self._len] = self._pend_t / self._pend_n
+        self._p[self._len] = self._pend_p / self._pend_n
+        self._len += 1
+        self._pend_t, self._pend_p, self._pend_n = 0.0, None, 0
+        if self._len == self.max_points:  # 모든 점이 같은 샘플 수를 나타내도록 가득 찬 직후 절반으로 압축
+            half = self.max_points // 2
+            self._t[:half] = self._t.reshape(half, 2).mean(1)
+            self._p[:half] = self._p.reshape(half, 2, -1).mean(1)
+            self._len, self._bucket = half, self._bucket * 2
+
+    def segment_table(self) -> list[dict]:
+        return [{"start_s": round(s["start"], 2), "end_s": round(s["end"], 2), "label": s["label"],
+                 "mean_prob": round(s["_sum"] / s["_n"], 4)} for s in self.segments]
+
+    def chart_data(self, top: int = 5) -> dict:
+        """평균 평활 확률 상위 top개 라벨의 (다운샘플된) 시계열 {라벨: [...]} (+ "t"). 최대 max_points개 점."""
+        if not self.n: return {"t": []}
+        t, arr = self._t[:self._len], self._p[:self._len]
+        if self._pend_n:
+            t = np.append(t, self._pend_t / self._pend_n)
+            arr = np.vstack([arr, self._pend_p / self._pend_n])
+        cols = np.argsort(-self._sum)[:top]
+        return {"t": t.tolist(), **{self.labels[i]: arr[:, i].tolist() for i in cols}}
+
+
+def classify_video(frames, predict_batch, labels, batch_size: int = 16, smooth: int = 5, total_frames: int = 0,
+                   chart_points: int = 512):
+    """frames(iter_frames)를 배치로 추론하며 배치마다 진행 상황을 yield. 마지막 yield가 최종 결과."""
+    timeline = LabelTimeline(labels, smooth, chart_points)
+    batch, n, last_idx = [], 0, 0
+    t0 = time.perf_counter()
+    infer_s = 0.0
+
+    def progress(done: bool):
+        elapsed = time.perf_counter() - t0
+        return {"done": done, "sampled_frames": n, "scanned_frames": last_idx + 1 if n else 0,
+                "progress": 1.0 if done else min(1.0, (last_idx + 1) / total_frames) if total_frames else 0.0,
+                "elapsed_s": round(elapsed, 2),
+                "frames_per_s": round(n / elapsed, 2) if elapsed else 0.0,
+                "scanned_frames_per_s": round((last_idx + 1) / elapsed, 2) if elapsed and n else 0.0,
+                "inference_frames_per_s": round(n / infer_s, 2) if infer_s else 0.0,
+                "timeline": timeline}
+
+    for idx, t, im in frames:
+        batch.append((t, im))
+        last_idx = idx
+        if len(batch) < batch_size: continue
+        ti = time.perf_counter()
+        probs = predict_batch([x for _, x in batch])
+        infer_s += time.perf_counter() - ti
+        for (tt, _), p in zip(batch, probs): timeline.add(tt, p)
+        n += len(batch)
+        batch.clear()
+        yield progress(False)
+    if batch:
+        ti = time.perf_counter()
+        probs = predict_batch([x for _, x in batch])
+        infer_s += time.perf_counter() - ti
+        for (tt, _), p in zip(batch, probs): timeline.add(tt, p)
+        n += len(batch)
+    yield progress(True)